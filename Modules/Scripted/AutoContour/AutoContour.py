@@ -22,6 +22,16 @@ try:
 except ImportError:
     pass
 
+# Inference modes understood by AutoContourLogic; read them from your inference code.
+DEFAULT_INFERENCE_OPTIONS = {
+    "precision": "float32",  # "float32", "float16" or "bfloat16"
+    "patchSize": (96, 96, 96),  # sliding-window patch size (IJK voxels)
+    "overlap": 0.25,  # sliding-window overlap ratio
+    "coarseToFine": False,  # low-resolution localization pass before full-resolution inference
+    "ensembleSize": 1,  # number of model folds to average
+    "testTimeAugmentation": False,  # average predictions over flipped inputs
+}
+
 
 class AutoContour(ScriptedLoadableModule):
     """Module for AI-based auto-contouring (add your model in the logic)."""
@@ -76,8 +86,22 @@ class AutoContourLogic(ScriptedLoadableModuleLogic):
     - Load your model (e.g. torch.load, MONAI, onnxruntime).
     - Run inference on the volume's image data.
     - Convert the output to a vtkMRMLSegmentationNode (or label map volume) and add to the scene.
+
+    Inference modes are described by ``inferenceOptions`` (see DEFAULT_INFERENCE_OPTIONS);
+    read them from your inference code so that AutoContourLib.Evaluation can compare modes.
     """
 
+    def __init__(self):
+        ScriptedLoadableModuleLogic.__init__(self)
+        self.inferenceOptions = dict(DEFAULT_INFERENCE_OPTIONS)
+
+    def setInferenceOptions(self, **options: object):
+        """Override inference options; unspecified options keep their default value."""
+        unknown = set(options) - set(DEFAULT_INFERENCE_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown inference options: {', '.join(sorted(unknown))}")
+        self.inferenceOptions = {**DEFAULT_INFERENCE_OPTIONS, **options}
+
     def run(self, volumeNode) -> Optional["vtkMRMLSegmentationNode"]:
         """
         Run AI segmentation on the given volume.
@@ -94,7 +118,8 @@ class AutoContourLogic(ScriptedLoadableModuleLogic):
         # Placeholder: create an empty segmentation so the pipeline is ready.
         # Replace this block with your model inference, e.g.:
         #   import torch
-        #   output = model(tensor_from_volume(volumeNode))
+        #   options = self.inferenceOptions
+        #   output = sliding_window(model, tensor_from_volume(volumeNode), options["patchSize"], options["overlap"])
         #   segmentation = label_map_to_segmentation(output)
         segmentationNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLSegmentationNode")
         segmentationNode.SetName(volumeNode.GetName() + " - AutoContour")
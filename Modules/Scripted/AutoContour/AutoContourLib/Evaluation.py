@@ -0,0 +1,323 @@
+"""
+Accuracy-versus-throughput evaluation of AutoContourLogic inference modes.
+
+Runs AutoContourLogic over a folder of image/reference-label pairs once per inference
+configuration and reports, for each configuration, per-structure Dice and Hausdorff
+distance next to latency, throughput and peak memory in a JSON report.
+
+Expected data layout (file names are matched between the two folders)::
+
+    dataDir/
+      images/case001.nrrd
+      labels/case001.nrrd
+
+Configurations are named overrides of AutoContour.DEFAULT_INFERENCE_OPTIONS, e.g.::
+
+    {
+      "baseline": {},
+      "fp16": {"precision": "float16"},
+      "fast": {"precision": "float16", "patchSize": [128, 128, 128], "overlap": 0.1},
+      "tta": {"testTimeAugmentation": true, "ensembleSize": 5}
+    }
+
+Usage from the application::
+
+    AutoSegmentSlicer --no-main-window --python-code "from AutoContourLib import Evaluation;
+      Evaluation.main(['/data', '-c', 'modes.json', '-l', 'labels.json', '-o', 'report.json']); slicer.util.exit()"
+
+Predicted segments are mapped to reference label values by segment name, either through an
+explicit label map (JSON ``{"liver": 1, "spleen": 2}``, ``--label-map``) or through the color
+table of the reference label volume. Segment names that do not resolve are an error.
+
+Inference needs the MRML scene and therefore runs sequentially on the main thread. Metrics of a
+case are computed after its timed window has closed and before the next case starts, so latency,
+throughput and peak memory only account for inference; the per-structure Hausdorff distances of
+a case are computed in parallel threads (see AutoContourLib.Metrics).
+
+Peak GPU memory is measured per case when the model uses torch with CUDA. Per-case host peak memory
+is Linux-only (it relies on resetting VmHWM); on other systems, or when the reset is not
+permitted, ``hostPeakMemoryMB`` is None rather than a process-lifetime peak that would carry over
+from one configuration to the next.
+
+``hausdorff95Mm`` is the larger of the two directed 95th-percentile surface distances
+(MONAI / DeepMind surface-distance convention).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from types import ModuleType
+from typing import Optional
+
+import numpy as np
+import slicer
+import vtk
+
+from AutoContour import DEFAULT_INFERENCE_OPTIONS, AutoContourLogic
+from AutoContourLib.Metrics import computeMetrics
+from AutoContourLib.Report import segmentLabelValues, summarizeResults
+
+IMAGE_EXTENSIONS = (".nrrd", ".nhdr", ".nii", ".nii.gz", ".mha", ".mhd")
+
+
+def findCases(dataDir: str) -> list[tuple[str, str, str]]:
+    """Return (caseName, imagePath, labelPath) for every image that has a reference label."""
+    imagesDir = os.path.join(dataDir, "images")
+    labelsDir = os.path.join(dataDir, "labels")
+    cases = []
+    for fileName in sorted(os.listdir(imagesDir)):
+        if not fileName.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        labelPath = os.path.join(labelsDir, fileName)
+        if not os.path.exists(labelPath):
+            logging.warning(f"No reference label for {fileName}, skipping")
+            continue
+        cases.append((fileName.split(".", 1)[0], os.path.join(imagesDir, fileName), labelPath))
+    return cases
+
+
+#
+# Resource usage
+#
+
+
+def _torchCuda() -> Optional[ModuleType]:
+    """Return torch.cuda if the model already imported torch and a GPU is in use, otherwise None."""
+    torch = sys.modules.get("torch")
+    if torch is None or not torch.cuda.is_available():
+        return None
+    return torch.cuda
+
+
+def _resetPeakMemory() -> bool:
+    """Reset peak memory counters and return whether the host peak now only covers what follows.
+
+    Only Linux allows resetting the host high-water mark (VmHWM, through /proc/self/clear_refs);
+    elsewhere, or when the reset is not permitted, the host peak would span the whole process.
+    """
+    cuda = _torchCuda()
+    if cuda is not None:
+        cuda.reset_peak_memory_stats()
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _hostPeakMemoryMB() -> Optional[float]:
+    """Host high-water mark of the process (Linux only)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def _devicePeakMemoryMB() -> Optional[float]:
+    cuda = _torchCuda()
+    return None if cuda is None else cuda.max_memory_allocated() / 2**20
+
+
+#
+# Evaluation
+#
+
+
+class AutoContourEvaluation:
+    """Run AutoContourLogic under several inference configurations and collect accuracy and speed.
+
+    Args:
+        cases: (caseName, imagePath, labelPath) tuples, see findCases().
+        configurations: mapping of configuration name to AutoContourLogic inference option overrides.
+        labelMap: mapping of predicted segment name to reference label value; if None, segment
+            names are looked up in the color table of each reference label volume.
+        workers: number of threads computing the metrics of a case (outside the timed window).
+        warmupRuns: untimed runs on the first case before measuring each configuration
+            (model loading, kernel compilation, caches).
+    """
+
+    def __init__(
+        self,
+        cases: list[tuple[str, str, str]],
+        configurations: dict[str, dict],
+        labelMap: Optional[dict[str, int]] = None,
+        workers: Optional[int] = None,
+        warmupRuns: int = 1,
+    ):
+        self.cases = cases
+        self.configurations = configurations
+        self.labelMap = labelMap
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.warmupRuns = warmupRuns
+        self.logic = AutoContourLogic()
+        self._warnedHostPeak = False
+
+    def run(self) -> dict:
+        """Evaluate every configuration and return the report."""
+        report = {
+            "system": {
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "python": platform.python_version(),
+                "slicer": slicer.app.applicationVersion,
+            },
+            "defaultOptions": DEFAULT_INFERENCE_OPTIONS,
+            "labelMap": self.labelMap,
+            "configurations": {},
+        }
+        for name, options in self.configurations.items():
+            logging.info(f"Evaluating configuration '{name}' on {len(self.cases)} cases")
+            report["configurations"][name] = self.evaluateConfiguration(options)
+        return report
+
+    def evaluateConfiguration(self, options: dict) -> dict:
+        self.logic.setInferenceOptions(**options)
+        for _ in range(self.warmupRuns if self.cases else 0):
+            self._runCase(*self.cases[0])
+
+        results = []
+        for caseName, imagePath, labelPath in self.cases:
+            timing, reference, prediction, spacing, labelNames = self._runCase(caseName, imagePath, labelPath)
+            # Metrics are computed before the next case is timed so they never compete with inference
+            structures = computeMetrics(reference, prediction, spacing, workers=self.workers)
+            del reference, prediction
+            results.append({"case": caseName, **timing, "labelNames": labelNames, "structures": structures})
+
+        return {
+            "options": self.logic.inferenceOptions,
+            "summary": summarizeResults(results),
+            "cases": results,
+        }
+
+    def _runCase(self, caseName: str, imagePath: str, labelPath: str) -> tuple:
+        """Run inference on one case and return its timing and the label maps to compare."""
+        volumeNode = slicer.util.loadVolume(imagePath)
+        referenceNode = slicer.util.loadLabelVolume(labelPath)
+        predictionNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLLabelMapVolumeNode")
+        segmentationNode = None
+        try:
+            hostPeakIsPerCase = _resetPeakMemory()
+            if not hostPeakIsPerCase and not self._warnedHostPeak:
+                logging.warning("Per-case host peak memory is not available on this system; reporting None")
+                self._warnedHostPeak = True
+            startTime = time.perf_counter()
+            segmentationNode = self.logic.run(volumeNode)
+            # Looked up after run() so that a model importing torch lazily is still synchronized
+            cuda = _torchCuda()
+            if cuda is not None:
+                cuda.synchronize()
+            latency = time.perf_counter() - startTime
+            timing = {
+                "latencySeconds": latency,
+                "voxels": int(np.prod(volumeNode.GetImageData().GetDimensions())),
+                "hostPeakMemoryMB": _hostPeakMemoryMB() if hostPeakIsPerCase else None,
+                "devicePeakMemoryMB": _devicePeakMemoryMB(),
+            }
+            if segmentationNode is None:
+                raise RuntimeError(f"AutoContourLogic returned no segmentation for case {caseName}")
+
+            colorNode = referenceNode.GetDisplayNode().GetColorNode() if referenceNode.GetDisplayNode() else None
+            segmentation = segmentationNode.GetSegmentation()
+            segmentIds = vtk.vtkStringArray()
+            segmentation.GetSegmentIDs(segmentIds)
+            segmentNames = [
+                segmentation.GetSegment(segmentIds.GetValue(i)).GetName() for i in range(segmentIds.GetNumberOfValues())
+            ]
+            labelValues = segmentLabelValues(
+                segmentNames, self.labelMap, colorNode.GetColorIndexByName if colorNode is not None else None
+            )
+
+            reference = slicer.util.arrayFromVolume(referenceNode).astype(np.intp)
+            if segmentNames:
+                # Without a color table, segments are exported as 1..N in segmentIds order
+                if not slicer.modules.segmentations.logic().ExportSegmentsToLabelmapNode(
+                    segmentationNode,
+                    segmentIds,
+                    predictionNode,
+                    referenceNode,
+                    slicer.vtkSegmentation.EXTENT_REFERENCE_GEOMETRY,
+                ):
+                    raise RuntimeError(f"Failed to export predicted segments of case {caseName} to a labelmap")
+                lookup = np.array([0, *labelValues], dtype=np.intp)
+                prediction = lookup[slicer.util.arrayFromVolume(predictionNode)]
+            else:
+                prediction = np.zeros_like(reference)
+            spacing = tuple(reversed(referenceNode.GetSpacing()))  # arrays are KJI
+
+            if self.labelMap is not None:
+                labelNames = {int(value): name for name, value in self.labelMap.items()}
+            elif colorNode is not None:
+                labelNames = {
+                    int(label): colorNode.GetColorName(int(label))
+                    for label in np.flatnonzero(np.bincount(reference.ravel()))
+                    if label > 0
+                }
+            else:
+                labelNames = {}
+            return timing, reference, prediction, spacing, labelNames
+        finally:
+            for node in (volumeNode, referenceNode, predictionNode, segmentationNode):
+                if node is not None:
+                    slicer.mrmlScene.RemoveNode(node)
+
+
+def runEvaluation(  # noqa: PLR0913
+    dataDir: str,
+    configurations: dict[str, dict],
+    outputPath: Optional[str] = None,
+    *,
+    labelMap: Optional[dict[str, int]] = None,
+    workers: Optional[int] = None,
+    warmupRuns: int = 1,
+) -> dict:
+    """Evaluate `configurations` on the cases found in `dataDir` and optionally write the JSON report."""
+    cases = findCases(dataDir)
+    if not cases:
+        raise ValueError(f"No image/label pairs found in {dataDir}")
+    report = AutoContourEvaluation(
+        cases, configurations, labelMap=labelMap, workers=workers, warmupRuns=warmupRuns
+    ).run()
+    if outputPath:
+        with open(outputPath, "w") as f:
+            json.dump(report, f, indent=2)
+        logging.info(f"Evaluation report written to {outputPath}")
+    return report
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate AutoContour accuracy and throughput per inference mode.")
+    parser.add_argument("dataDir", help="folder containing images/ and labels/ subfolders")
+    parser.add_argument(
+        "-c",
+        "--configurations",
+        help="JSON file mapping configuration names to inference option overrides (default: defaults only)",
+    )
+    parser.add_argument(
+        "-l",
+        "--label-map",
+        help="JSON file mapping segment names to reference label values (default: reference color table)",
+    )
+    parser.add_argument("-o", "--output", default="AutoContourEvaluation.json", help="JSON report path")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="threads computing metrics of a case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per configuration")
+    args = parser.parse_args(argv)
+
+    configurations = {"default": {}}
+    if args.configurations:
+        with open(args.configurations) as f:
+            configurations = json.load(f)
+    labelMap = None
+    if args.label_map:
+        with open(args.label_map) as f:
+            labelMap = json.load(f)
+    runEvaluation(
+        args.dataDir, configurations, args.output, labelMap=labelMap, workers=args.workers, warmupRuns=args.warmup
+    )
@@ -0,0 +1,90 @@
+"""
+Label correspondence and aggregation of AutoContourLib.Evaluation results.
+
+Pure Python/NumPy (no Slicer dependency) so they can be tested outside the application.
+"""
+
+import statistics
+from typing import Callable, Optional
+
+import numpy as np
+
+METRICS = ("dice", "hausdorffMm", "hausdorff95Mm")
+
+
+def segmentLabelValues(
+    segmentNames: list[str],
+    labelMap: Optional[dict[str, int]],
+    colorIndexByName: Optional[Callable[[str], int]] = None,
+) -> list[int]:
+    """Reference label value of every predicted segment, looked up by segment name.
+
+    Uses `labelMap` (segment name to label value) when given, otherwise `colorIndexByName`
+    (e.g. the GetColorIndexByName method of the reference color table, returning -1 when not found).
+    Raises ValueError listing the names that do not resolve to a non-background label value.
+    """
+    values = []
+    unresolved = []
+    for name in segmentNames:
+        if labelMap is not None:
+            value = labelMap.get(name, -1)
+        else:
+            value = colorIndexByName(name) if colorIndexByName is not None else -1
+        if value <= 0:
+            unresolved.append(name)
+        values.append(int(value))
+    if unresolved:
+        source = "the label map" if labelMap is not None else "the reference color table (pass a label map)"
+        raise ValueError(f"Segments not found in {source}: {', '.join(unresolved)}")
+    return values
+
+
+def summarizeResults(results: list[dict]) -> dict:
+    """Aggregate per-case results of one configuration.
+
+    Hausdorff means only cover cases where the structure exists in both label maps, so they are
+    reported with `hausdorffCases` and `missedCases`; a configuration missing a structure
+    entirely scores Dice 0 for it but does not degrade its Hausdorff mean.
+    """
+    if not results:
+        return {}
+    latencies = [r["latencySeconds"] for r in results]
+    totalTime = sum(latencies)
+    hostPeaks = [r["hostPeakMemoryMB"] for r in results if r["hostPeakMemoryMB"] is not None]
+    devicePeaks = [r["devicePeakMemoryMB"] for r in results if r["devicePeakMemoryMB"] is not None]
+
+    structures = {}
+    for result in results:
+        for label, metrics in result["structures"].items():
+            structure = structures.setdefault(label, {"name": None, "missed": 0, "values": {}})
+            structure["name"] = structure["name"] or result["labelNames"].get(label)
+            structure["missed"] += metrics["missed"]
+            for metric in METRICS:
+                if metrics[metric] is not None:
+                    structure["values"].setdefault(metric, []).append(metrics[metric])
+    for structure in structures.values():
+        values = structure.pop("values")
+        structure["cases"] = len(values.get("dice", []))
+        structure["hausdorffCases"] = len(values.get("hausdorffMm", []))
+        structure["missedCases"] = structure.pop("missed")
+        for metric in METRICS:
+            structure[f"mean{metric[0].upper()}{metric[1:]}"] = (
+                statistics.fmean(values[metric]) if values.get(metric) else None
+            )
+    dices = [s["meanDice"] for s in structures.values() if s["meanDice"] is not None]
+
+    return {
+        "cases": len(results),
+        "meanLatencySeconds": statistics.fmean(latencies),
+        "medianLatencySeconds": statistics.median(latencies),
+        "p95LatencySeconds": float(np.percentile(latencies, 95)),
+        "throughputCasesPerSecond": len(results) / totalTime if totalTime > 0 else None,
+        "throughputVoxelsPerSecond": sum(r["voxels"] for r in results) / totalTime if totalTime > 0 else None,
+        "hostPeakMemoryMB": max(hostPeaks) if hostPeaks else None,
+        "devicePeakMemoryMB": max(devicePeaks) if devicePeaks else None,
+        "meanDice": statistics.fmean(dices) if dices else None,
+        "structureCases": sum(s["cases"] for s in structures.values()),
+        "hausdorffCases": sum(s["hausdorffCases"] for s in structures.values()),
+        "missedCases": sum(s["missedCases"] for s in structures.values()),
+        "structures": structures,
+    }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make AutoContourLib importable when running pytest from a source checkout
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
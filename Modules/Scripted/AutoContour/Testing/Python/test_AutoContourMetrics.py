@@ -0,0 +1,216 @@
+"""Tests for the Slicer-independent metrics and report helpers of AutoContourLib (run with ``python -m pytest``)."""
+
+import re
+from typing import Optional
+
+import numpy as np
+import pytest
+from scipy import ndimage
+from scipy.spatial.distance import cdist
+
+from AutoContourLib.Metrics import _surfaces, _unionBox, computeMetrics, diceScores, hausdorffDistances
+from AutoContourLib.Report import segmentLabelValues, summarizeResults
+
+SPACING = (2.0, 0.8, 1.1)
+
+
+def _bruteForceHausdorff(
+    reference: np.ndarray, prediction: np.ndarray, spacing: tuple[float, ...]
+) -> tuple[float, float]:
+    """Hausdorff and 95% Hausdorff (max of directed 95th percentiles) distances between the surfaces
+    of two binary masks, including image-border faces.
+    """
+
+    def surfacePoints(mask: np.ndarray) -> np.ndarray:
+        padded = np.pad(mask, 1)
+        surface = padded & ~ndimage.binary_erosion(padded)
+        return (np.argwhere(surface) - 1) * spacing
+
+    distances = cdist(surfacePoints(reference), surfacePoints(prediction))
+    toPrediction, toReference = distances.min(axis=1), distances.min(axis=0)
+    return (
+        max(toPrediction.max(), toReference.max()),
+        max(np.percentile(toPrediction, 95), np.percentile(toReference, 95)),
+    )
+
+
+@pytest.fixture
+def labelMaps() -> tuple[np.ndarray, np.ndarray]:
+    reference = np.zeros((20, 30, 25), dtype=np.intp)
+    prediction = np.zeros_like(reference)
+    reference[3:10, 5:15, 4:12] = 1
+    reference[12:18, 10:25, 10:20] = 7  # sparse label values exercise the lookup-table remap
+    reference[15:20, 0:4, 0:5] = 4  # touches three image borders, missed by the prediction
+    prediction[4:11, 5:14, 4:13] = 1
+    prediction[12:17, 12:25, 9:20] = 7  # touches the image border on axis 1
+    prediction[0:2, 0:2, 0:2] = 2  # false positive only
+    return reference, prediction
+
+
+def test_dice_matches_per_label_computation(labelMaps: tuple[np.ndarray, np.ndarray]):
+    reference, prediction = labelMaps
+    labels = np.array([1, 2, 4, 7])
+    dice = diceScores(reference, prediction, labels)
+    for label, value in zip(labels, dice):
+        a, b = reference == label, prediction == label
+        assert value == pytest.approx(2 * (a & b).sum() / (a.sum() + b.sum()))
+
+
+def test_dice_is_nan_for_labels_absent_from_both_maps(labelMaps: tuple[np.ndarray, np.ndarray]):
+    reference, prediction = labelMaps
+    dice = diceScores(reference, prediction, np.array([1, 3, 9]))
+    assert not np.isnan(dice[0])
+    assert np.isnan(dice[1:]).all()
+
+
+def test_hausdorff_matches_brute_force(labelMaps: tuple[np.ndarray, np.ndarray]):
+    reference, prediction = labelMaps
+    hd, hd95 = hausdorffDistances(reference, prediction, np.array([1, 7]), SPACING)
+    for i, label in enumerate((1, 7)):
+        expectedHd, expectedHd95 = _bruteForceHausdorff(reference == label, prediction == label, SPACING)
+        assert hd[i] == pytest.approx(expectedHd)
+        assert hd95[i] == pytest.approx(expectedHd95)
+
+
+def test_hausdorff95_is_max_of_directed_percentiles():
+    """A small distant false-positive blob separates the directed definition from the pooled one."""
+    reference = np.zeros((40, 12, 12), dtype=np.intp)
+    reference[2:10, 2:10, 2:10] = 1
+    prediction = reference.copy()
+    prediction[30:33, 4:7, 4:7] = 1
+    _, hd95 = hausdorffDistances(reference, prediction, np.array([1]), (1.0, 1.0, 1.0))
+    referencePoints = np.argwhere(_surfaces(reference))
+    predictionPoints = np.argwhere(_surfaces(prediction))
+    distances = cdist(referencePoints, predictionPoints)
+    toPrediction, toReference = distances.min(axis=1), distances.min(axis=0)
+    pooled = np.percentile(np.concatenate([toPrediction, toReference]), 95)
+    directed = max(np.percentile(toPrediction, 95), np.percentile(toReference, 95))
+    assert directed != pytest.approx(pooled)
+    assert hd95[0] == pytest.approx(directed)
+
+
+def test_hausdorff_is_parallel_invariant(labelMaps: tuple[np.ndarray, np.ndarray]):
+    reference, prediction = labelMaps
+    labels = np.array([1, 2, 4, 7])
+    serial = hausdorffDistances(reference, prediction, labels, SPACING, workers=1)
+    parallel = hausdorffDistances(reference, prediction, labels, SPACING, workers=4)
+    np.testing.assert_array_equal(serial[0], parallel[0])
+    np.testing.assert_array_equal(serial[1], parallel[1])
+
+
+def test_surfaces_close_structures_at_image_border():
+    labelArray = np.zeros((5, 5, 5), dtype=np.intp)
+    labelArray[0:3, :, :] = 1  # fills the slab up to the borders of axes 1 and 2
+    surface = _surfaces(labelArray)
+    assert surface[0].all()  # image border face
+    assert surface[2].all()  # interface with background
+    assert not surface[1, 1:-1, 1:-1].any()  # interior
+    assert surface[1, 0, :].all()  # side borders
+    assert surface[1, :, -1].all()
+    assert not surface[3:].any()  # background is never surface
+
+
+def test_union_box_is_padded_and_clipped():
+    first = (slice(0, 3), slice(4, 6))
+    second = (slice(2, 5), slice(5, 10))
+    assert _unionBox(first, second, (5, 20)) == (slice(0, 5), slice(3, 11))
+
+
+def test_cropped_distances_unaffected_by_crop():
+    """Structures far apart from each other must give the same distance as an uncropped computation."""
+    reference = np.zeros((10, 40, 10), dtype=np.intp)
+    prediction = np.zeros_like(reference)
+    reference[4:6, 2:4, 4:6] = 1
+    prediction[4:6, 34:36, 4:6] = 1
+    hd, _ = hausdorffDistances(reference, prediction, np.array([1]), SPACING)
+    assert hd[0] == pytest.approx(_bruteForceHausdorff(reference == 1, prediction == 1, SPACING)[0])
+
+
+def test_compute_metrics_labels_in_one_map_only(labelMaps: tuple[np.ndarray, np.ndarray]):
+    reference, prediction = labelMaps
+    metrics = computeMetrics(reference, prediction, SPACING)
+    assert sorted(metrics) == [1, 2, 4, 7]
+    # Present in the reference only: missed, Dice 0 and no Hausdorff distance
+    assert metrics[4] == {"dice": 0.0, "hausdorffMm": None, "hausdorff95Mm": None, "missed": True}
+    # Present in the prediction only: false positive, not a miss
+    assert metrics[2] == {"dice": 0.0, "hausdorffMm": None, "hausdorff95Mm": None, "missed": False}
+    assert not metrics[1]["missed"]
+    assert metrics[7]["hausdorffMm"] is not None
+
+
+def test_segment_label_values_from_label_map_and_color_table():
+    assert segmentLabelValues(["liver", "spleen"], {"liver": 1, "spleen": 6}) == [1, 6]
+    colorTable = {"Liver": 5}
+    assert segmentLabelValues(["Liver"], None, lambda name: colorTable.get(name, -1)) == [5]
+    # The label map takes precedence over the color table
+    assert segmentLabelValues(["Liver"], {"Liver": 2}, lambda name: colorTable.get(name, -1)) == [2]
+    assert segmentLabelValues([], None) == []
+
+
+@pytest.mark.parametrize(
+    ("labelMap", "colorIndexByName", "message"),
+    [
+        ({"liver": 1}, None, "label map: spleen"),
+        ({"liver": 1, "spleen": 0}, None, "label map: spleen"),  # background is not a structure
+        (None, lambda name: {"liver": 1}.get(name, -1), "color table (pass a label map): spleen"),
+        (None, None, "color table (pass a label map): liver, spleen"),
+    ],
+)
+def test_segment_label_values_unresolved_names(labelMap, colorIndexByName, message):  # noqa: ANN001
+    with pytest.raises(ValueError, match=re.escape(message)):
+        segmentLabelValues(["liver", "spleen"], labelMap, colorIndexByName)
+
+
+def _caseResult(latency: float, structures: dict, hostPeak: Optional[float] = None) -> dict:
+    return {
+        "latencySeconds": latency,
+        "voxels": 1000,
+        "hostPeakMemoryMB": hostPeak,
+        "devicePeakMemoryMB": None,
+        "labelNames": {1: "liver"},
+        "structures": structures,
+    }
+
+
+def test_summarize_counts_misses_and_false_positives(labelMaps: tuple[np.ndarray, np.ndarray]):
+    reference, prediction = labelMaps
+    metrics = computeMetrics(reference, prediction, SPACING)
+    perfect = computeMetrics(reference, reference, SPACING)
+    summary = summarizeResults([_caseResult(1.0, metrics, 100.0), _caseResult(3.0, perfect, 300.0)])
+
+    assert summary["cases"] == 2
+    assert summary["meanLatencySeconds"] == pytest.approx(2.0)
+    assert summary["medianLatencySeconds"] == pytest.approx(2.0)
+    assert summary["p95LatencySeconds"] == pytest.approx(2.9)
+    assert summary["throughputCasesPerSecond"] == pytest.approx(0.5)
+    assert summary["throughputVoxelsPerSecond"] == pytest.approx(500.0)
+    assert summary["hostPeakMemoryMB"] == 300.0
+    assert summary["devicePeakMemoryMB"] is None
+
+    structures = summary["structures"]
+    assert structures[1]["name"] == "liver"
+    # Missed in the first case: Dice 0 counts, the undefined Hausdorff is excluded but visible
+    assert structures[4] == {
+        "name": None,
+        "cases": 2,
+        "hausdorffCases": 1,
+        "missedCases": 1,
+        "meanDice": pytest.approx(0.5),
+        "meanHausdorffMm": 0.0,
+        "meanHausdorff95Mm": 0.0,
+    }
+    # False positive only: not a miss, no Hausdorff distance
+    assert structures[2]["cases"] == 1
+    assert structures[2]["hausdorffCases"] == 0
+    assert structures[2]["missedCases"] == 0
+    assert structures[2]["meanDice"] == 0.0
+    assert structures[2]["meanHausdorffMm"] is None
+
+    assert summary["structureCases"] == 2 + 1 + 2 + 2
+    assert summary["hausdorffCases"] == 2 + 0 + 1 + 2
+    assert summary["missedCases"] == 1
+    assert summary["meanDice"] == pytest.approx(np.mean([s["meanDice"] for s in structures.values()]))
+
+
+def test_summarize_empty_results():
+    assert summarizeResults([]) == {}